@@ -6,20 +6,11 @@ import time
 
 from pathlib import Path
 
-from source import constants, gui as gui_module
+from source import gui as gui_module, logging_setup
 from source.engine import Engine
 from source.gui import GUI
 
 LOG = logging.getLogger(__name__)
-logging.basicConfig(
-    format="%(asctime)s [%(name)s] [%(threadName)s] [%(levelname)s] %(message)s",
-    datefmt="%m/%d/%Y %I:%M:%S%p",
-    level=logging.INFO,
-    handlers=[
-        logging.FileHandler(constants.LOG_FILE, mode="w", encoding="utf-8"),
-        logging.StreamHandler(),
-    ],
-)
 
 
 def _get_base_directory() -> Path:
@@ -36,8 +27,12 @@ def main() -> None:
     engine = engine = Engine(_get_base_directory())
     gui = GUI(engine)
     gui.run()
-    logging.shutdown()
 
 
 if __name__ == "__main__":
-    main()
+    listener = logging_setup.configure()
+    try:
+        main()
+    finally:
+        listener.stop()
+        logging.shutdown()
@@ -1,13 +1,23 @@
 import AO3
 import bs4
+import functools
 import logging
+import lxml.etree
+import os
+import re
 import requests
+import threading
+import time
 import urllib.parse
 
+from collections import deque
 from math import ceil
+from pathlib import Path
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+from requests.adapters import HTTPAdapter
 from typing import Optional, List
+from urllib3.util.retry import Retry
 
 from AO3 import threadable
 from AO3.common import get_work_from_banner
@@ -18,8 +28,140 @@ from AO3.works import Work
 
 from . import constants, utils
 
+try:
+    import requests_cache
+except ImportError:
+    requests_cache = None
+
 LOG = logging.getLogger(__name__)
 
+# Shared session used for requests when the caller does not supply one, so
+# that consecutive page fetches reuse keep-alive connections to AO3 instead of
+# performing a new TCP + TLS handshake each time.
+_SESSION = requests.Session()
+
+
+class RateLimiter:
+    """Thread-safe limit of at most `max_requests` requests in any sliding
+    window of `window_seconds` seconds.
+
+    Each caller reserves the earliest available slot while holding the lock,
+    then sleeps until that slot outside of the lock, so concurrent requests
+    are paced instead of all waking up at the same time.
+    """
+
+    def __init__(self, max_requests: int, window_seconds: float):
+        self._window_seconds = window_seconds
+        self._slots = deque(maxlen=max_requests)
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """Blocks until another request can be sent."""
+        with self._lock:
+            now = time.monotonic()
+            slot = now
+            if len(self._slots) == self._slots.maxlen:
+                slot = max(now, self._slots[0] + self._window_seconds)
+            self._slots.append(slot)
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def limit_requests(
+    max_requests: int = constants.RATE_LIMIT_REQUESTS,
+    window_seconds: float = constants.RATE_LIMIT_WINDOW_SECONDS,
+) -> None:
+    """Limits the rate of all requests sent through the AO3 requester.
+
+    This replaces `AO3.utils.limit_requests`, whose request log is not safe to
+    share between worker threads (it can fail with `pop from empty list`).
+    """
+    requester.setRQTW(-1)
+    rate_limiter = RateLimiter(max_requests, window_seconds)
+    request = type(requester).request
+
+    def limited_request(*args, **kwargs):
+        rate_limiter.wait()
+        return request(requester, *args, **kwargs)
+
+    requester.request = limited_request
+
+
+def create_pooled_adapter(pool_maxsize: int) -> HTTPAdapter:
+    """Creates an HTTP adapter with a connection pool large enough to be
+    shared by `pool_maxsize` worker threads.
+
+    Rate limit responses (429) are not retried here, since the engine handles
+    those with its own backoff.
+    """
+    return HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[500, 502, 503, 504],
+            raise_on_status=False,
+        ),
+    )
+
+
+_SESSION.mount("https://", create_pooled_adapter(constants.DEFAULT_CONCURRENCY_LIMIT))
+
+
+def enable_http_cache(cache_file: Path, expire_after: int, pool_maxsize: int) -> bool:
+    """Replaces the shared session with one that caches successful GET
+    responses on disk for `expire_after` seconds.
+
+    Only responses with status 200 are cached, so rate limit responses are
+    always fetched again. Returns False if requests-cache is not installed,
+    caching is disabled or the cache could not be opened, in which case the
+    uncached session keeps being used.
+    """
+    global _SESSION
+    if expire_after <= 0:
+        return False
+    if requests_cache is None:
+        LOG.info("requests-cache is not installed, HTTP cache will not be used.")
+        return False
+
+    try:
+        cached_session = requests_cache.CachedSession(
+            str(cache_file),
+            backend="sqlite",
+            expire_after=expire_after,
+            cache_control=True,
+            allowable_methods=("GET",),
+            allowable_codes=(200,),
+        )
+    except Exception as e:
+        LOG.error(
+            "Could not open HTTP cache at %s, it will not be used: %s", cache_file, e
+        )
+        return False
+
+    _SESSION = cached_session
+    _SESSION.mount("https://", create_pooled_adapter(pool_maxsize))
+    LOG.info("Caching HTTP responses for %ss in: %s", expire_after, cache_file)
+    return True
+
+
+# Callers only ever look at a single list on each page, so only those parts of
+# the document are parsed instead of building the whole AO3 page tree.
+_PAGINATION_STRAINER = SoupStrainer("ol", attrs={"role": "navigation"})
+
+# Work IDs on a results page are extracted with XPath, which is evaluated by
+# lxml in C instead of walking a BeautifulSoup tree in Python.
+_WORKS_LIST_XPATH = lxml.etree.XPath(
+    "//ol[contains(concat(' ', normalize-space(@class), ' '), ' work ') "
+    "and contains(concat(' ', normalize-space(@class), ' '), ' index ')]"
+)
+_WORK_ELEMENT_IDS_XPATH = lxml.etree.XPath(".//li[@role='article' and .//h4]/@id")
+_WORK_ELEMENT_ID_PREFIX = "work_"
+
+_AO3_URL_PREFIX = f"https://{constants.AO3_DOMAIN}/"
+_PAGE_PARAMETER_REGEX = re.compile(r"([?&])page=[^&]*")
+
 
 def get_ao3_url(url: str, page: Optional[int] = None) -> Optional[str]:
     """GIven an AO3 URL listing works that can span multiple pages, return the
@@ -27,6 +169,24 @@ def get_ao3_url(url: str, page: Optional[int] = None) -> Optional[str]:
 
     Returns None if the URL was not an AO3 URL.
     """
+    return _get_ao3_url(url, page)
+
+
+@functools.lru_cache(maxsize=4096)
+def _get_ao3_url(url: str, page: Optional[int]) -> Optional[str]:
+    """Memoized implementation of `get_ao3_url`."""
+    # Fast path for the common case of only changing the page of a URL that
+    # was already normalized by this function.
+    if page is not None and url.startswith(_AO3_URL_PREFIX) and "#" not in url:
+        new_url, n_replaced = _PAGE_PARAMETER_REGEX.subn(rf"\1page={page}", url)
+        if n_replaced == 1:
+            return new_url
+        if n_replaced == 0:
+            separator = "&" if "?" in url else "?"
+            if url.endswith(("?", "&")):
+                separator = ""
+            return f"{url}{separator}page={page}"
+
     url_parts = urllib.parse.urlparse(url)
     if url_parts.netloc != constants.AO3_DOMAIN:
         return None
@@ -42,6 +202,69 @@ def get_ao3_url(url: str, page: Optional[int] = None) -> Optional[str]:
     return urllib.parse.urlunparse(url_parts)
 
 
+def download_work_to_file(work: Work, filetype: str, filename: Path) -> int:
+    """Downloads the work in the specified filetype and saves it to the file.
+
+    Unlike `Work.download`, the response is streamed to disk in chunks rather
+    than held in memory. The content is written to a temporary `.part` file
+    which is only moved to the final location once the download completes,
+    so an interrupted download never leaves a truncated file behind. Callers
+    must not download the same work to the same file concurrently.
+
+    Returns the number of bytes written. Nothing is saved if the response was
+    empty.
+    """
+    url = _get_download_url(work, filetype)
+    # Send the request with the work's session, through the AO3 requester, like
+    # Work.get does. Unlike Work.get, this also closes the response when we are
+    # being rate limited, so its pooled connection is released.
+    kwargs = {"stream": True}
+    if work._session is not None:
+        kwargs["session"] = work._session.session
+    with requester.request("get", url, **kwargs) as req:
+        if req.status_code == 429:
+            raise AO3.utils.HTTPError(
+                "We are being rate-limited. Try again in a while or reduce the "
+                "number of requests"
+            )
+        if not req.ok:
+            raise AO3.utils.DownloadError(
+                "An error occurred while downloading the work"
+            )
+
+        part_filename = filename.with_name(f"{filename.name}.part")
+        n_bytes = 0
+        try:
+            with open(part_filename, "wb") as file:
+                for chunk in req.iter_content(chunk_size=constants.DOWNLOAD_CHUNK_SIZE):
+                    file.write(chunk)
+                    n_bytes += len(chunk)
+            if n_bytes:
+                os.replace(part_filename, filename)
+        finally:
+            if part_filename.exists():
+                part_filename.unlink()
+    return n_bytes
+
+
+def _get_download_url(work: Work, filetype: str) -> str:
+    """Returns the URL to download the loaded work in the specified filetype.
+
+    This looks up the link the same way `Work.download` does.
+    """
+    if not work.loaded:
+        raise AO3.utils.UnloadedError(
+            "Work isn't loaded. Have you tried calling Work.reload()?"
+        )
+    download_button = work._soup.find("li", {"class": "download"})
+    for download_type in download_button.find_all("li"):
+        if download_type.a.get_text() == filetype.upper():
+            return f"https://{constants.AO3_DOMAIN}/{download_type.a.attrs['href']}"
+    raise AO3.utils.UnexpectedResponseError(
+        f"Filetype '{filetype}' is not available for download"
+    )
+
+
 class Results:
     url: str
     page_start: int = 1
@@ -68,7 +291,7 @@ class Results:
         """Sends a request to the AO3 website with the defined search parameters, 
         and updates all info. This function is threadable.
         """
-        soup = _get(self.url, self.session)
+        soup = _get(self.url, self.session, _PAGINATION_STRAINER)
 
         # Try and find the pages navigation bar at the bottom of a results page
         # The very last element is the Next -> arrow. The second last item should be
@@ -85,8 +308,10 @@ class Results:
                 self.page_end = self.pages
         except Exception as e:
             LOG.warning(
-                f"Got exception trying to find number of pages for "
-                f"`{self.url}`: {e}. Assuming number of pages is 1."
+                "Got exception trying to find number of pages for `%s`: %s. "
+                "Assuming number of pages is 1.",
+                self.url,
+                e,
             )
             self.pages = 1
 
@@ -112,44 +337,65 @@ class ResultsPage:
         if url is None:
             return
 
-        soup = _get(url, self.session)
+        tree = _get_tree(url, self.session)
 
-        results = soup.find("ol", {"class": ("work", "index", "group")})
-        if not isinstance(results, bs4.element.Tag):
+        results = _WORKS_LIST_XPATH(tree) if tree is not None else []
+        if not results:
             LOG.warning(
-                f"Could not find works element on page: `{url}`. No works IDs "
-                f"will be returned."
+                "Could not find works element on page: `%s`. No works IDs "
+                "will be returned.",
+                url,
             )
             return
 
-        work_ids = []
-        for work in results.find_all("li", {"role": "article"}):
-            if work.h4 is None:
-                continue
-            work_id = work.get("id", None)
-            if work_id is None:
-                continue
-            work_ids.append(int(work_id.lstrip("work_")))
+        self.work_ids = [
+            int(work_id[len(_WORK_ELEMENT_ID_PREFIX) :])
+            for work_id in _WORK_ELEMENT_IDS_XPATH(results[0])
+            if work_id.startswith(_WORK_ELEMENT_ID_PREFIX)
+        ]
 
-        self.work_ids = work_ids
 
-
-def _get(url: str, session: Optional[requests.Session] = None) -> bs4.BeautifulSoup:
-    """Returns the page for the search as a Soup object
+def _request(url: str, session: Optional[requests.Session] = None) -> bytes:
+    """Returns the content of the page
     Args:
         url (str): Generic AO3 URL.
     Returns:
-        bs4.BeautifulSoup: Search result's soup
+        bytes: Page content
+    Raises:
+        AO3.utils.HTTPError: If error code 429 was returned
     """
-
-    if session is None:
-        req = requester.request("get", url)
-    else:
-        req = session.get(url)
+    req = requester.request("get", url, session=session or _SESSION)
     if req.status_code == 429:
         raise AO3.utils.HTTPError(
             "We are being rate-limited. Try again in a while or reduce the "
             "number of requests."
         )
-    soup = BeautifulSoup(req.content, features="lxml")
+    return req.content
+
+
+def _get(
+    url: str,
+    session: Optional[requests.Session] = None,
+    strainer: Optional[SoupStrainer] = None,
+) -> bs4.BeautifulSoup:
+    """Returns the page for the search as a Soup object
+    Args:
+        url (str): Generic AO3 URL.
+        strainer (SoupStrainer, optional): Only parse the matching elements.
+    Returns:
+        bs4.BeautifulSoup: Search result's soup
+    """
+    soup = BeautifulSoup(_request(url, session), features="lxml", parse_only=strainer)
     return soup
+
+
+def _get_tree(
+    url: str, session: Optional[requests.Session] = None
+) -> Optional[lxml.etree._Element]:
+    """Returns the page for the search as an lxml element tree
+    Args:
+        url (str): Generic AO3 URL.
+    Returns:
+        lxml.etree._Element: Root of the page, or None if the page was empty
+    """
+    return lxml.etree.HTML(_request(url, session))
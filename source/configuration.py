@@ -3,12 +3,74 @@ import logging
 import os
 
 from pathlib import Path
+from typing import Any, Callable, List, Optional, Tuple
 
 from . import constants
 
 LOG = logging.getLogger(__name__)
 
 
+def _parse_filetype(value: str) -> str:
+    filetype = value.upper()
+    assert filetype in constants.VALID_FILETYPES
+    return filetype
+
+
+def _parse_flag(value: str) -> bool:
+    return bool(int(value))
+
+
+def _parse_positive_int(value: str) -> int:
+    number = int(value)
+    assert number > 0
+    return number
+
+
+def _parse_non_negative_int(value: str) -> int:
+    number = int(value)
+    assert number >= 0
+    return number
+
+
+# (section, key, parser, attribute, requirement) for every configuration value.
+# Parsers raise on invalid values, in which case the current value is kept and
+# the requirement is logged.
+_SCHEMA: List[Tuple[str, str, Callable[[str], Any], str, str]] = [
+    ("credentials", "username", str, "username", "must be a string"),
+    ("credentials", "password", str, "password", "must be a string"),
+    ("downloads", "directory", Path, "downloads_dir", "must be a path"),
+    (
+        "downloads",
+        "filetype",
+        _parse_filetype,
+        "filetype",
+        f"valid types are: {', '.join(sorted(constants.VALID_FILETYPES))}",
+    ),
+    (
+        "engine",
+        "should_use_threading",
+        _parse_flag,
+        "should_use_threading",
+        "must be 0 or 1",
+    ),
+    (
+        "engine",
+        "concurrency_limit",
+        _parse_positive_int,
+        "concurrency_limit",
+        "must be an integer > 0",
+    ),
+    ("engine", "should_rate_limit", _parse_flag, "should_rate_limit", "must be 0 or 1"),
+    (
+        "engine",
+        "http_cache_ttl_seconds",
+        _parse_non_negative_int,
+        "http_cache_ttl_seconds",
+        "must be an integer >= 0",
+    ),
+]
+
+
 class Configuration:
     username: str
     password: str
@@ -17,8 +79,10 @@ class Configuration:
     should_use_threading: bool
     concurrency_limit: int
     should_rate_limit: bool
+    http_cache_ttl_seconds: int
 
     _filename: Path
+    _file_signature: Optional[Tuple[int, int]]
 
     def __init__(self, filename: Path):
         self.username = ""
@@ -28,8 +92,10 @@ class Configuration:
         self.should_use_threading = True
         self.concurrency_limit = constants.DEFAULT_CONCURRENCY_LIMIT
         self.should_rate_limit = False
+        self.http_cache_ttl_seconds = constants.DEFAULT_HTTP_CACHE_TTL_SECONDS
 
         self._filename = filename
+        self._file_signature = None
         if not self._filename.is_file():
             LOG.info(
                 f"No existing configuration file found, "
@@ -41,6 +107,13 @@ class Configuration:
 
     def parse_from_file(self) -> int:
         try:
+            # Settings in memory always match the file after it is read or
+            # written, so there's nothing to do if it hasn't changed since.
+            file_signature = self._get_file_signature()
+            if file_signature is not None and file_signature == self._file_signature:
+                LOG.info("Configuration file is unchanged, skipping parsing.")
+                return 0
+
             LOG.info(
                 f"Found existing configuration file at: " f"{self._filename.resolve()}"
             )
@@ -48,85 +121,20 @@ class Configuration:
             parsed_config = configparser.ConfigParser()
             parsed_config.read(self._filename)
 
-            if (
-                "credentials" in parsed_config
-                and "username" in parsed_config["credentials"]
-            ):
-                self.username = parsed_config["credentials"]["username"]
-
-            if (
-                "credentials" in parsed_config
-                and "password" in parsed_config["credentials"]
-            ):
-                self.password = parsed_config["credentials"]["password"]
-
-            if (
-                "downloads" in parsed_config
-                and "directory" in parsed_config["downloads"]
-            ):
-                self.downloads_dir = Path(parsed_config["downloads"]["directory"])
-
-            if (
-                "downloads" in parsed_config
-                and "filetype" in parsed_config["downloads"]
-            ):
-                filetype = parsed_config["downloads"]["filetype"].upper()
-                try:
-                    assert filetype.upper() in constants.VALID_FILETYPES
-                    self.filetype = filetype
-                except Exception:
-                    valid_filetypes_string = ", ".join(constants.VALID_FILETYPES)
-                    LOG.error(
-                        f"Invalid filetype specified in {self._filename}, "
-                        f"valid types are: {valid_filetypes_string}. Using default "
-                        f"filetype value of {constants.DEFAULT_DOWNLOADS_FILETYPE} "
-                        f"instead."
-                    )
-
-            if (
-                "engine" in parsed_config
-                and "should_use_threading" in parsed_config["engine"]
-            ):
-                try:
-                    self.should_use_threading = bool(
-                        int(parsed_config["engine"]["should_use_threading"])
-                    )
-                except Exception:
-                    LOG.error(
-                        f"Invalid value specified for "
-                        f"engine:should_use_threading, must be 0 or 1."
-                    )
-
-            if (
-                "engine" in parsed_config
-                and "concurrency_limit" in parsed_config["engine"]
-            ):
-                concurrency_limit = parsed_config["engine"]["concurrency_limit"]
+            for section, key, parse, attribute, requirement in _SCHEMA:
+                value = parsed_config.get(section, key, fallback=None)
+                if value is None:
+                    continue
                 try:
-                    self.concurrency_limit = int(concurrency_limit)
-                    assert self.concurrency_limit > 0
+                    setattr(self, attribute, parse(value))
                 except Exception:
                     LOG.error(
-                        f"Invalid value {concurrency_limit} specified for "
-                        f"concurrency limit, must be an integer > 0. Using "
-                        f"default value of {constants.DEFAULT_CONCURRENCY_LIMIT} "
-                        f"instead."
-                    )
-
-            if (
-                "engine" in parsed_config
-                and "should_rate_limit" in parsed_config["engine"]
-            ):
-                try:
-                    self.should_rate_limit = bool(
-                        int(parsed_config["engine"]["should_rate_limit"])
-                    )
-                except Exception:
-                    LOG.error(
-                        f"Invalid value specified for "
-                        f"engine:should_rate_limit, must be 0 or 1."
+                        f"Invalid value {value} specified for {section}:{key} "
+                        f"in {self._filename}, {requirement}. Using value of "
+                        f"{getattr(self, attribute)} instead."
                     )
 
+            self._file_signature = file_signature
             LOG.info(f"Done parsing existing configuration.")
             return 0
         except Exception as e:
@@ -138,9 +146,12 @@ class Configuration:
             return 1
 
     def write_to_file(self) -> int:
+        # Write to a temporary file first and move it into place, so that
+        # the existing configuration is never left partially written.
+        temporary_filename = self._filename.with_name(f"{self._filename.name}.tmp")
         try:
             LOG.info(f"Writing configuration to: {self._filename.resolve()}")
-            with open(self._filename, "w") as f:
+            with open(temporary_filename, "w") as f:
                 f.write(
                     constants.CONFIGURATION_FILE_TEMPLATE.format(
                         self.username,
@@ -150,9 +161,26 @@ class Configuration:
                         int(self.should_use_threading),
                         self.concurrency_limit,
                         int(self.should_rate_limit),
+                        self.http_cache_ttl_seconds,
                     )
                 )
+            os.replace(temporary_filename, self._filename)
+            self._file_signature = self._get_file_signature()
             LOG.info("Successfully wrote configuration file.")
             return 0
         except Exception:
+            self._file_signature = None
+            try:
+                temporary_filename.unlink()
+            except OSError:
+                pass
             return 1
+
+    def _get_file_signature(self) -> Optional[Tuple[int, int]]:
+        """Returns the (modification time, size) of the configuration file, or
+        None if it can't be read."""
+        try:
+            stat = self._filename.stat()
+            return (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
@@ -54,11 +54,19 @@ BOOKMARKS_DIR = "bookmarks"
 DEFAULT_DOWNLOADS_DIR = "Downloads/froyo"
 DEFAULT_DOWNLOADS_FILETYPE = "PDF"
 DEFAULT_CONCURRENCY_LIMIT = 20
+DEFAULT_HTTP_CACHE_TTL_SECONDS = 0
 
 INITIAL_SECONDS_BEFORE_RETRY = 10
+MAX_SECONDS_BEFORE_RETRY = 600
+RATE_LIMIT_REQUESTS = 12
+RATE_LIMIT_WINDOW_SECONDS = 60
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
 
 LOG_FILE = "log.txt"
+LOG_FILE_MAX_BYTES = 5 << 20
+LOG_FILE_BACKUP_COUNT = 3
 CONFIGURATION_FILE = "settings.ini"
+HTTP_CACHE_FILE = "http_cache.sqlite"
 
 CONFIGURATION_FILE_TEMPLATE = """; froyo config file
 ;
@@ -92,7 +100,10 @@ filetype={}
 ; threads. This will make bulk downloading a lot faster. The concurrency limit
 ; controls how many simultaneous requests can be running at the same time.
 ; Rate limiting will limit the number of requests to AO3 to 12 per minute.
+; If the requests-cache package is installed, pages listing works are cached
+; on disk for the specified number of seconds. Set to 0 to disable caching.
 should_use_threading={}
 concurrency_limit={}
 should_rate_limit={}
+http_cache_ttl_seconds={}
 """
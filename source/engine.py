@@ -1,18 +1,37 @@
 import AO3
 import enum
+import heapq
+import itertools
 import logging
+import operator
 import os
+import random
+import requests
 import sys
 import threading
 import time
 
+from collections import defaultdict
 from pathlib import Path
-from queue import Queue
+from requests.adapters import HTTPAdapter
+from queue import SimpleQueue
 from AO3 import GuestSession, Series, Session, User, Work
-from dataclasses import dataclass
 from slugify import slugify
-from threading import Lock, Thread, Timer
-from typing import Any, Callable, Dict, Hashable, List, Optional, Set, Tuple, Union
+from threading import Condition, Lock, Thread
+from typing import (
+    Any,
+    Callable,
+    DefaultDict,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 from . import ao3_extensions, constants, utils
 from .ao3_extensions import Results, ResultsPage
@@ -33,56 +52,117 @@ class Action(enum.Enum):
     LOGIN = 8
 
 
+# Actions whose identifier is a work ID tracked in the active ID set.
+WORK_ACTIONS = frozenset({Action.LOAD_WORK, Action.DOWNLOAD_WORK})
+
+_get_id = operator.attrgetter("id")
+
+
 class Status(enum.Enum):
     OK = 0
     ERROR = 1
     RETRY = 2
 
 
-@dataclass
 class WorkItem:
+    # Slots instead of a dataclass: `@dataclass(slots=True)` needs Python 3.10,
+    # and there can be one item per work in every loaded bookmark list.
+    __slots__ = ("work", "download_path", "load_lock", "download_lock")
+
     work: Work
-    download_path: Optional[Path] = None
+    download_path: Optional[Path]
+    # Held while loading the work, so it is only requested once at a time.
+    load_lock: Lock
+    # Held while downloading the work, so it is only downloaded once at a time.
+    download_lock: Lock
+
+    def __init__(self, work: Work, download_path: Optional[Path] = None):
+        self.work = work
+        self.download_path = download_path
+        self.load_lock = Lock()
+        self.download_lock = Lock()
 
 
 GUICallback = Callable[..., None]
-Args = List[Any]
 Kwargs = Dict[str, Any]
 
 
+def _do_nothing(*args: Any, **kwargs: Any) -> None:
+    """Stands in for callbacks that were not set, so that callers do not need
+    to check for None."""
+
+
 class Engine:
     base_dir: Path
     config: Configuration
     session: GuestSession
 
-    _queue: Queue
-    _items: Dict[int, WorkItem] = {}
-    _active_ids: Set[int] = set()
-    _threads: List[Thread] = []
-    _retries: Dict[Hashable, List[Timer]] = {}
+    _queue: SimpleQueue
+    _items: Dict[int, WorkItem]
+    _active_ids: Set[int]
+    _threads: List[Thread]
+    _retries: DefaultDict[Hashable, List[int]]
+    _retry_heap: List[Tuple[float, int, Hashable, Action]]
+    _retry_ids: Iterator[int]
+    _retry_thread: Thread
+    _is_shutting_down: bool
+    _download_paths: Dict[int, Path]
+    _user_downloads_dir: Optional[Path]
+    _http_adapter: HTTPAdapter
 
     _time_before_retry: int = constants.INITIAL_SECONDS_BEFORE_RETRY
 
-    _items_lock: Lock
     _active_ids_lock: Lock
-    _retry_lock: Lock
+    _retry_condition: Condition
+    _random: random.Random
 
-    _action_callbacks: Dict[Action, Tuple[Optional[GUICallback], Optional[GUICallback]]]
-    _enqueue_callbacks: Dict[
-        Action, Tuple[Optional[GUICallback], Optional[GUICallback]]
-    ]
+    _action_callbacks: Dict[Action, Tuple[GUICallback, GUICallback]]
+    _enqueue_callbacks: Dict[Action, Tuple[GUICallback, GUICallback]]
+    _action_handlers: Dict[Action, Callable[[Any], Tuple[Status, Kwargs]]]
 
     def __init__(self, base_directory: Path):
-        self._queue = Queue()
-        self._action_callbacks = {action: (None, None) for action in Action}
-        self._enqueue_callbacks = {action: (None, None) for action in Action}
-
-        self._items_lock = Lock()
+        self._queue = SimpleQueue()
+        self._action_callbacks = {
+            action: (_do_nothing, _do_nothing) for action in Action
+        }
+        self._enqueue_callbacks = {
+            action: (_do_nothing, _do_nothing) for action in Action
+        }
+        self._action_handlers = {
+            Action.LOAD_WORK: self._load_work,
+            Action.DOWNLOAD_WORK: self._download_work,
+            Action.LOAD_SERIES: self._load_works_from_series,
+            Action.LOAD_USER_WORKS: self._load_works_from_user,
+            Action.LOAD_USER_BOOKMARKS: self._load_bookmarks_from_user,
+            Action.LOAD_RESULTS_LIST: lambda identifier: (
+                self._load_pages_from_results_list(*identifier)
+            ),
+            Action.LOAD_RESULTS_PAGE: lambda identifier: (
+                self._load_works_from_results_page(*identifier)
+            ),
+            Action.LOGIN: lambda identifier: self._login(*identifier),
+        }
+
+        # Single dict/set operations are atomic under CPython's GIL, so this
+        # lock is only held where the active IDs and items change together.
         self._active_ids_lock = Lock()
-        self._retry_lock = Lock()
+        # Guards the retry heap. Single-key operations on the retries map are
+        # atomic under the GIL, so cancelling a retry does not need it.
+        self._retry_condition = Condition()
+        self._random = random.Random()
+
+        self._items = {}
+        self._active_ids = set()
+        self._threads = []
+        self._retries = defaultdict(list)
+        self._retry_heap = []
+        self._retry_ids = itertools.count()
+        self._is_shutting_down = False
+        self._download_paths = {}
+        self._user_downloads_dir = None
 
         self.base_dir = base_directory
-        LOG.info(f"Current working directory: {self.base_dir}")
+        LOG.info("Current working directory: %s", self.base_dir)
 
         # Validate data directory structure
         data_dir = self.base_dir / constants.DATA_DIR
@@ -93,13 +173,23 @@ class Engine:
         self.config = Configuration(self.base_dir / constants.CONFIGURATION_FILE)
 
         if self.config.should_rate_limit:
-            AO3.utils.limit_requests()
+            ao3_extensions.limit_requests()
 
-        # Initialize worker threads
         n_workers = 1
         if self.config.should_use_threading and self.config.concurrency_limit > 1:
             n_workers = self.config.concurrency_limit
+        # Set up the HTTP cache before starting any threads, which would keep
+        # the process alive if this raised.
+        ao3_extensions.enable_http_cache(
+            data_dir / constants.HTTP_CACHE_FILE,
+            self.config.http_cache_ttl_seconds,
+            n_workers,
+        )
+
+        # Initialize worker threads
         self._init_worker_threads(n_workers)
+        self._init_retry_thread()
+        self._init_connection_pool()
 
     # Initialization functions
     def _init_worker_threads(self, n_workers: int) -> None:
@@ -113,54 +203,55 @@ class Engine:
             thread.start()
             self._threads.append(thread)
 
+    def _init_retry_thread(self) -> None:
+        """Creates the thread that re-enqueues actions once their retry is due.
+
+        A single thread waits on a heap of pending retries, instead of one
+        sleeping timer thread per retry.
+        """
+        self._retry_thread = Thread(target=self._process_retries)
+        self._retry_thread.start()
+
+    def _init_connection_pool(self) -> None:
+        """Creates a connection pool large enough that every worker thread can
+        keep a connection to AO3 alive between requests, and mounts it on the
+        current session.
+        """
+        self._http_adapter = ao3_extensions.create_pooled_adapter(
+            max(1, len(self._threads))
+        )
+        self._mount_connection_pool()
+
+    def _mount_connection_pool(self) -> None:
+        """Mounts the engine's connection pool on the current session.
+
+        The pool outlives sessions, so connections opened before a login or
+        logout are reused afterwards instead of doing new TLS handshakes.
+        Cookies are kept by the session, not the pool, so no credentials are
+        shared between sessions.
+        """
+        self.session.session.mount("https://", self._http_adapter)
+
     # Functions for interacting with GUI callbacks
     def set_action_callbacks(
         self,
         callbacks: Dict[Action, Tuple[Optional[GUICallback], Optional[GUICallback]]],
     ) -> None:
         """Sets the callbacks (before, after) for each action."""
-        self._action_callbacks.update(callbacks)
+        self._action_callbacks.update(
+            (action, (before or _do_nothing, after or _do_nothing))
+            for action, (before, after) in callbacks.items()
+        )
 
     def set_enqueue_callbacks(
         self,
         callbacks: Dict[Action, Tuple[Optional[GUICallback], Optional[GUICallback]]],
     ) -> None:
         """Sets the callbacks to be run when enqueuing action."""
-        self._enqueue_callbacks.update(callbacks)
-
-    def _run_before_enqueue(
-        self, action: Action, args: Args = [], kwargs: Kwargs = {}
-    ) -> None:
-        """If a callback is registered to be run before enqueueing the action, 
-        run it."""
-        before_enqueue = self._enqueue_callbacks[action][0]
-        if before_enqueue:
-            before_enqueue(*args, **kwargs)
-
-    def _run_after_enqueue(
-        self, action: Action, args: Args = [], kwargs: Kwargs = {}
-    ) -> None:
-        """If a callback is registered to be run after enqueueing the action, 
-        run it."""
-        after_enqueue = self._enqueue_callbacks[action][1]
-        if after_enqueue:
-            after_enqueue(*args, **kwargs)
-
-    def _run_before_action(
-        self, action: Action, args: Args = [], kwargs: Kwargs = {}
-    ) -> None:
-        """If a callback is registered to be run before the action, run it."""
-        before_action = self._action_callbacks[action][0]
-        if before_action:
-            before_action(*args, **kwargs)
-
-    def _run_after_action(
-        self, action: Action, args: Args = [], kwargs: Kwargs = {}
-    ) -> None:
-        """If a callback is registered to be run after the action, run it."""
-        after_action = self._action_callbacks[action][1]
-        if after_action:
-            after_action(*args, **kwargs)
+        self._enqueue_callbacks.update(
+            (action, (before or _do_nothing, after or _do_nothing))
+            for action, (before, after) in callbacks.items()
+        )
 
     # Public API to be called from the GUI
     def login(self, username: str, password: str) -> None:
@@ -172,6 +263,8 @@ class Engine:
         try:
             del self.session
             self.session = GuestSession()
+            self._mount_connection_pool()
+            self._clear_path_caches()
             LOG.info("Logged out.")
             return 0
         except Exception:
@@ -184,7 +277,7 @@ class Engine:
             self.config.parse_from_file()
             return 0
         except Exception as e:
-            LOG.error(f"Error getting settings: {e}")
+            LOG.error("Error getting settings: %s", e)
             return 1
 
     def update_settings(
@@ -205,35 +298,34 @@ class Engine:
         self.config.should_use_threading = should_use_threading
         self.config.concurrency_limit = concurrency_limit
         self.config.should_rate_limit = should_rate_limit
+        self._clear_path_caches()
 
         return self.config.write_to_file()
 
-    def remove(self, work_id: int) -> None:
+    def remove(self, work_id: int) -> bool:
         """Remove an ID from the active IDs set.
 
         This is usually called when the user removes a work through the GUI.
+        Returns whether the ID was active.
         """
-        self._active_ids_lock.acquire()
-        self._active_ids.remove(work_id)
-        self._active_ids_lock.release()
-        self._items_lock.acquire()
-        if work_id in self._items:
-            del self._items[work_id]
-        self._items_lock.release()
-        for action in Action:
-            self._cancel_retries(work_id, action)
+        with self._active_ids_lock:
+            was_active = work_id in self._active_ids
+            self._active_ids.discard(work_id)
+            self._items.pop(work_id, None)
+        self._download_paths.pop(work_id, None)
+        for action in WORK_ACTIONS:
+            self._retries.pop((work_id, action), None)
+        return was_active
 
     def remove_all(self) -> None:
         """Remove all IDs from the active IDs set.
 
         The removal functions are CPU bound so it's okay to be non-async here.
         """
-        self._active_ids_lock.acquire()
-        self._active_ids.clear()
-        self._active_ids_lock.release()
-        self._items_lock.acquire()
-        self._items.clear()
-        self._items_lock.release()
+        with self._active_ids_lock:
+            self._active_ids.clear()
+            self._items.clear()
+        self._download_paths.clear()
         self._cancel_all_retries()
 
     def download_work(self, work_id: int) -> None:
@@ -244,8 +336,7 @@ class Engine:
     def download_all(self) -> None:
         """Enqueues download actions for all work IDs in the active set."""
         self._verify_download_directory_exists()
-        for work_id in self._active_ids:
-            self._enqueue_work_action(work_id, Action.DOWNLOAD_WORK)
+        self._enqueue_work_actions(list(self._active_ids), Action.DOWNLOAD_WORK)
 
     def stop(self) -> None:
         """Shuts down the engine cleanly.
@@ -253,24 +344,31 @@ class Engine:
         Ensures all threads are properly terminated
         """
         LOG.info("Shutting down engine, please wait...")
-        self._queue.put((-1, Action._SENTINEL))
+        # One sentinel per worker, each worker exits after taking one.
+        for _ in self._threads:
+            self._queue.put((-1, Action._SENTINEL))
         self.remove_all()
         LOG.info("Shutting down worker threads.")
         for thread in self._threads:
             thread.join()
         LOG.info("Shut down worker threads.")
-        LOG.info("Shuting down retry threads...")
-        self._cancel_all_retries()
-        LOG.info("Shut down retry threads.")
+        LOG.info("Shutting down retry thread...")
+        with self._retry_condition:
+            self._is_shutting_down = True
+            self._retry_condition.notify()
+        self._retry_thread.join()
+        LOG.info("Shut down retry thread.")
 
     def load_works_from_work_urls(self, urls: Set[str]) -> None:
         """Load works from the URLs supplied."""
+        work_ids = []
         for url in urls:
-            work_id = AO3.utils.workid_from_url(url)
+            work_id = utils.work_id_from_url(url)
             if work_id:
-                self._enqueue_work_action(work_id, Action.LOAD_WORK)
+                work_ids.append(work_id)
             else:
-                LOG.error(f"{url} was not a valid work URL, skipping.")
+                LOG.error("%s was not a valid work URL, skipping.", url)
+        self._enqueue_work_actions(work_ids, Action.LOAD_WORK)
 
     def load_works_from_series_urls(self, urls: Set[str]) -> None:
         """Load works from the series URLs supplied.
@@ -281,10 +379,10 @@ class Engine:
         for url in urls:
             series_id = utils.series_id_from_url(url)
             if series_id:
-                LOG.info(f"Loading works from series {series_id}...")
+                LOG.info("Loading works from series %s...", series_id)
                 self._enqueue_action(series_id, Action.LOAD_SERIES)
             else:
-                LOG.error(f"{url} was not a valid series URL, skipping.")
+                LOG.error("%s was not a valid series URL, skipping.", url)
 
     def load_works_by_usernames(self, usernames: Set[str]) -> None:
         """Load works by every username supplied.
@@ -317,7 +415,7 @@ class Engine:
                     (ao3_url, page_start, page_end), Action.LOAD_RESULTS_LIST
                 )
         else:
-            LOG.error(f"{url} was not a valid AO3 URL, skipping.")
+            LOG.error("%s was not a valid AO3 URL, skipping.", url)
 
     # Threading helper functions
     def _enqueue_work_action(self, work_id: int, action: Action) -> None:
@@ -325,11 +423,24 @@ class Engine:
 
         This should only be used for works since it adds to the active ID set.
         """
-        self._active_ids_lock.acquire()
         self._active_ids.add(work_id)
-        self._active_ids_lock.release()
         self._enqueue_action(work_id, action, run_callbacks=True)
 
+    def _enqueue_work_actions(self, work_ids: Iterable[int], action: Action) -> None:
+        """Enqueues an (id, action) entry on the worker queue for each work ID.
+
+        Duplicate IDs are only enqueued once, the active ID set is updated
+        with a single set operation and the enqueue callbacks are looked up
+        once for the whole batch.
+        """
+        work_ids = list(dict.fromkeys(work_ids))
+        self._active_ids.update(work_ids)
+        before_enqueue, after_enqueue = self._enqueue_callbacks[action]
+        for work_id in work_ids:
+            before_enqueue(work_id)
+            self._queue.put((work_id, action))
+            after_enqueue(work_id)
+
     def _enqueue_action(
         self, identifier: Hashable, action: Action, run_callbacks=False
     ) -> None:
@@ -339,111 +450,102 @@ class Engine:
             self._queue.put((identifier, action))
             return
 
-        self._run_before_enqueue(action, args=[identifier])
+        before_enqueue, after_enqueue = self._enqueue_callbacks[action]
+        before_enqueue(identifier)
         self._queue.put((identifier, action))
-        self._run_after_enqueue(action, args=[identifier])
-
-    def _is_work_id_active(self, work_id: int, action: Action) -> bool:
-        """Locking read of the active work ID set.
-    
-        If an ID is not active, it may have been deleted by the user through
-        the GUI. In that case, we no longer care about existing queued actions
-        for this ID, so we can discard those tasks in the worker threads.
-
-        This should only work for works. For things like series, users, this
-        should always return true.
-
-        TODO: track series and users as separate identifier sets
-        """
-        if action not in {Action.LOAD_WORK, Action.DOWNLOAD_WORK}:
-            return True
-
-        self._active_ids_lock.acquire()
-        is_active = work_id in self._active_ids
-        self._active_ids_lock.release()
-        return is_active
+        after_enqueue(identifier)
 
-    def _get_work_item(self, work_id: int) -> Optional[WorkItem]:
-        """Updates the item cache with the provided value.
+    def _get_or_create_work_item(self, work_id: int) -> WorkItem:
+        """Reads the item cache for the provided work ID, adding an unloaded
+        item if there is none yet.
 
-        This requries acquiring the lock first in order to prevent corruption
-        of the active ID set, since many threads can be accessing it at the same
-        time.
+        Concurrent workers for the same ID all share the item that was added
+        first. The item is only added while the ID is still active, under the
+        same lock as remove(), so that a late worker does not add back a work
+        the user has just removed; it gets an item that is not cached instead.
         """
-        self._items_lock.acquire()
-        work_item = self._items.get(work_id, None)
-        self._items_lock.release()
-        return work_item
-
-    def _set_work_item(self, work_id: int, item: WorkItem) -> None:
-        """Updates the item cache with the provided value.
-
-        This requries acquiring the lock first in order to prevent corruption
-        of the active ID set, since many threads can be accessing it at the same
-        time.
-        """
-        self._items_lock.acquire()
-        self._items[work_id] = item
-        self._items_lock.release()
+        work_item = self._items.get(work_id)
+        if work_item is not None:
+            return work_item
+
+        with self._active_ids_lock:
+            if work_id not in self._active_ids:
+                return WorkItem(work=Work(work_id, load=False))
+            return self._items.setdefault(
+                work_id, WorkItem(work=Work(work_id, load=False))
+            )
 
     def _cancel_retries(self, identifier: Hashable, action: Action) -> None:
-        """Cancel all current threads attempting to retry this (identifier, action).
+        """Cancel all pending retries of this (identifier, action).
 
-        Usually called when the action succeeds in another thread.
+        Usually called when the action succeeds in another thread. Cancelled
+        entries stay on the retry heap, but are skipped once they are due.
         """
-        key = (identifier, action)
-        self._retry_lock.acquire()
-        if key not in self._retries:
-            self._retry_lock.release()
-            return
-
-        for thread in self._retries[key]:
-            thread.cancel()
-            thread.join()
-
-        del self._retries[(identifier, action)]
-        self._retry_lock.release()
+        self._retries.pop((identifier, action), None)
 
     def _cancel_all_retries(self) -> None:
         """Cancel all retries."""
-        self._retry_lock.acquire()
-        for identifier in list(self._retries):
-            threads = self._retries.pop(identifier)
-            for thread in threads:
-                thread.cancel()
-                thread.join()
-        self._retry_lock.release()
+        with self._retry_condition:
+            self._retries.clear()
+            self._retry_heap.clear()
 
     def _get_seconds_before_retry(self, identifier: Hashable, action: Action) -> int:
         """Get the time in seconds to wait before retrying the action for the ID.
 
-        The wait time increases exponentially, doubling based on how many times
-        we have attempted to retry.
+        The wait time is picked at random, so that workers that were rate
+        limited at the same time do not all retry at the same time again. Its
+        upper bound increases exponentially, doubling based on how many times
+        we have attempted to retry, up to a cap.
         """
-        self._retry_lock.acquire()
         n_retries = len(self._retries.get((identifier, action), []))
-        self._retry_lock.release()
-        retry_time = constants.INITIAL_SECONDS_BEFORE_RETRY * (1 << n_retries)
-        return retry_time
+        max_retry_time = min(
+            constants.MAX_SECONDS_BEFORE_RETRY,
+            constants.INITIAL_SECONDS_BEFORE_RETRY * (2 << n_retries),
+        )
+        return self._random.randint(
+            constants.INITIAL_SECONDS_BEFORE_RETRY, max_retry_time
+        )
 
     def _retry(self, identifier: Hashable, action: Action, wait_time: int) -> None:
-        """Spawn a new thread to enqueue the action again after some time.
+        """Schedule the action to be enqueued again after some time.
         """
         LOG.info(
-            f"Retry {action.name} for identifier {identifier} after {wait_time}s..."
+            "Retry %s for identifier %s after %ss...",
+            action.name,
+            identifier,
+            wait_time,
         )
-        self._retry_lock.acquire()
+        with self._retry_condition:
+            retry_id = next(self._retry_ids)
+            heapq.heappush(
+                self._retry_heap,
+                (time.monotonic() + wait_time, retry_id, identifier, action),
+            )
 
-        retry = Timer(wait_time, self._enqueue_action, args=(identifier, action))
-        retry.start()
+            self._retries[(identifier, action)].append(retry_id)
+            self._retry_condition.notify()
 
-        key = (identifier, action)
-        if key in self._retries:
-            self._retries[key].append(retry)
-        else:
-            self._retries[key] = [retry]
+    def _process_retries(self) -> None:
+        """Function run by the retry thread.
 
-        self._retry_lock.release()
+        Sleeps until the earliest retry on the heap is due, then enqueues its
+        action again unless the retry was cancelled in the meantime.
+        """
+        with self._retry_condition:
+            while not self._is_shutting_down:
+                if not self._retry_heap:
+                    self._retry_condition.wait()
+                    continue
+
+                due_time, retry_id, identifier, action = self._retry_heap[0]
+                wait_time = due_time - time.monotonic()
+                if wait_time > 0:
+                    self._retry_condition.wait(wait_time)
+                    continue
+
+                heapq.heappop(self._retry_heap)
+                if retry_id in self._retries.get((identifier, action), []):
+                    self._enqueue_action(identifier, action)
 
     def _process_queue(self) -> None:
         """Function run by worker threads.
@@ -455,43 +557,28 @@ class Engine:
             identifier, action = self._queue.get()
             if action == Action._SENTINEL:
                 # Exit condition
-                self._queue.put((-1, Action._SENTINEL))
                 return
 
-            if not self._is_work_id_active(identifier, action):
+            # Only works are tracked in the active ID set, actions for things
+            # like series and users are always processed.
+            # The membership checks below don't take _active_ids_lock: a set
+            # lookup is atomic under the GIL, and IDs are added before their
+            # tasks are enqueued, so a stale read only means a task for a work
+            # that was just removed does some extra work before it is dropped.
+            # TODO: track series and users as separate identifier sets
+            is_work_action = action in WORK_ACTIONS
+            if is_work_action and identifier not in self._active_ids:
                 # If the work ID is not in the active set, this usually indicates
                 # that the user deleted the work through the UI. This means
                 # there is no longer a need to process this request.
                 continue
 
-            args = [identifier]
-            self._run_before_action(action, args=args)
+            before_action, after_action = self._action_callbacks[action]
+            before_action(identifier)
 
-            status = Status.ERROR
-            kwargs = {}
-            if action == Action.LOAD_WORK:
-                status, kwargs = self._load_work(identifier)
-            elif action == Action.DOWNLOAD_WORK:
-                status, kwargs = self._download_work(identifier)
-            elif action == Action.LOAD_SERIES:
-                status, kwargs = self._load_works_from_series(identifier)
-            elif action == Action.LOAD_USER_WORKS:
-                status, kwargs = self._load_works_from_user(identifier)
-            elif action == Action.LOAD_USER_BOOKMARKS:
-                status, kwargs = self._load_bookmarks_from_user(identifier)
-            elif action == Action.LOAD_RESULTS_LIST:
-                url, page_start, page_end = identifier
-                status, kwargs = self._load_pages_from_results_list(
-                    url, page_start, page_end
-                )
-            elif action == Action.LOAD_RESULTS_PAGE:
-                url, page = identifier
-                status, kwargs = self._load_works_from_results_page(url, page)
-            elif action == Action.LOGIN:
-                username, password = identifier
-                status, kwargs = self._login(username, password)
-
-            if not self._is_work_id_active(identifier, action):
+            status, kwargs = self._action_handlers[action](identifier)
+
+            if is_work_action and identifier not in self._active_ids:
                 # Again, work ID may have been removed since the processing was
                 # done. If so, there is no need to run retry or the callback.
                 continue
@@ -503,8 +590,7 @@ class Engine:
             elif status == Status.OK:
                 self._cancel_retries(identifier, action)
 
-            args.append(status)
-            self._run_after_action(action, args=args, kwargs=kwargs)
+            after_action(identifier, status, **kwargs)
 
     def _reload_work_with_current_session(self, work: Work) -> None:
         """Function to be called from a worker thread.
@@ -515,11 +601,11 @@ class Engine:
             work.set_session(self.session)
             # TODO: determine whether load_chapters=False is useful here.
             work.reload(load_chapters=False)
-            LOG.info(f"Loaded work id {work.id}.")
+            LOG.info("Loaded work id %s.", work.id)
         except AttributeError as e:
             # This is a hack due to how the AO3 API works right now.
             if not self.session.is_authed:
-                LOG.warning(f"Work {work.id} is only accessible to logged-in users.")
+                LOG.warning("Work %s is only accessible to logged-in users.", work.id)
                 raise AO3.utils.AuthError("Work is only accessible to logged-in users.")
             else:
                 raise e
@@ -529,20 +615,28 @@ class Engine:
 
         This will try to login with the specified credentials.
         """
-        self.session = GuestSession()
+        if isinstance(self.session, AO3.Session):
+            # Fall back to a guest session if this login fails. There is no
+            # need to replace a session that is already a guest session.
+            self.session = GuestSession()
+            self._mount_connection_pool()
+            self._clear_path_caches()
         try:
             self.session = Session(username, password)
+            self._mount_connection_pool()
+            # The session changed even if refreshing the token fails below.
+            self._clear_path_caches()
             self.session.refresh_auth_token()
-            LOG.info(f"Authenticated as user: {self.session.username}")
+            LOG.info("Authenticated as user: %s", self.session.username)
             return (Status.OK, {"user": self.session.user})
         except AO3.utils.HTTPError as e:
-            LOG.error(f"HTTP error: {e}. Not logged in.")
+            LOG.error("HTTP error: %s. Not logged in.", e)
             return (Status.ERROR, {"error": "You are being rate limited"})
         except AO3.utils.LoginError:
             LOG.error("Invalid username or password.")
             return (Status.ERROR, {"error": "Invalid username or password"})
         except Exception as e:
-            LOG.error(f"Error logging in: {e}")
+            LOG.error("Error logging in: %s", e)
             return (Status.ERROR, {"error": str(e)})
 
     def _load_work(self, work_id: int) -> Tuple[Status, Kwargs]:
@@ -552,26 +646,29 @@ class Engine:
         already loaded, otherwise it will attempt to load work metadata, 
         retrying if a rate limit error occurs.
         """
-        work_item = self._get_work_item(work_id) or WorkItem(
-            work=Work(work_id, load=False)
-        )
+        work_item = self._get_or_create_work_item(work_id)
 
         if work_item.work.loaded:
-            LOG.info(f"Work id {work_id} was already loaded, skipping.")
+            LOG.info("Work id %s was already loaded, skipping.", work_id)
             return (Status.OK, {"work_item": work_item})
 
-        try:
-            self._reload_work_with_current_session(work_item.work)
-            self._set_work_item(work_id, work_item)
-            return (Status.OK, {"work_item": work_item})
-        except AO3.utils.HTTPError:
-            LOG.warning(
-                f"Hit rate limit trying to load work {work_id}. Attempting to retry..."
-            )
-            return (Status.RETRY, {})
-        except Exception as e:
-            LOG.error(f"Error loading work id {work_id}: {e}")
-            return (Status.ERROR, {"error": str(e)})
+        with work_item.load_lock:
+            if work_item.work.loaded:
+                # Another worker loaded this work while we were waiting.
+                return (Status.OK, {"work_item": work_item})
+
+            try:
+                self._reload_work_with_current_session(work_item.work)
+                return (Status.OK, {"work_item": work_item})
+            except AO3.utils.HTTPError:
+                LOG.warning(
+                    "Hit rate limit trying to load work %s. Attempting to retry...",
+                    work_id,
+                )
+                return (Status.RETRY, {})
+            except Exception as e:
+                LOG.error("Error loading work id %s: %s", work_id, e)
+                return (Status.ERROR, {"error": str(e)})
 
     def _download_work(self, work_id: int) -> Tuple[Status, Kwargs]:
         """Function to be called from a worker thread.
@@ -582,52 +679,67 @@ class Engine:
         already downloaded, otherwise it will attempt to download, retrying
         if a rate limit error occurs.
         """
-        work_item = self._get_work_item(work_id) or WorkItem(
-            work=Work(work_id, load=False)
-        )
-
-        if work_item.download_path and work_item.download_path.is_file():
-            LOG.info(f"Work id {work_id} was already downloaded, skipping.")
-            return (Status.OK, {"work_item": work_item})
-
-        try:
-            if not work_item.work.loaded:
-                # Make sure we're loaded before we download
-                self._run_before_action(Action.LOAD_WORK, args=[work_id])
-                status, kwargs = self._load_work(work_id)
-                self._run_after_action(
-                    Action.LOAD_WORK, args=[work_id, status], kwargs=kwargs
+        work_item = self._get_or_create_work_item(work_id)
+
+        # Downloads of the same work, e.g. from its download button and from
+        # "download all", would otherwise write to the same partial file.
+        with work_item.download_lock:
+            if work_item.download_path and work_item.download_path.is_file():
+                LOG.info("Work id %s was already downloaded, skipping.", work_id)
+                return (Status.OK, {"work_item": work_item})
+
+            try:
+                if not work_item.work.loaded:
+                    # Make sure we're loaded before we download
+                    before_load, after_load = self._action_callbacks[Action.LOAD_WORK]
+                    before_load(work_id)
+                    status, kwargs = self._load_work(work_id)
+                    after_load(work_id, status, **kwargs)
+                    if status != Status.OK:
+                        return (status, kwargs)
+                    self._cancel_retries(work_id, Action.LOAD_WORK)
+                    # The load may have populated a different item than the one
+                    # we started with, continue with the one that is now loaded.
+                    work_item = kwargs["work_item"]
+
+                download_path = self._get_download_file_path(work_item.work)
+                if self._is_download_up_to_date(work_item.work, download_path):
+                    LOG.info(
+                        "Work id %s is already up to date at %s, skipping.",
+                        work_id,
+                        download_path,
+                    )
+                    work_item.download_path = download_path
+                    return (Status.OK, {"work_item": work_item})
+
+                LOG.info(
+                    "Downloading %s - %s to: %s",
+                    work_item.work.id,
+                    work_item.work.title,
+                    download_path,
                 )
-                if status != Status.OK:
-                    return (status, kwargs)
-                self._cancel_retries(work_id, Action.LOAD_WORK)
-
-            download_path = self._get_download_file_path(work_item.work)
-            LOG.info(
-                f"Downloading {work_item.work.id} - {work_item.work.title} to: {download_path}"
-            )
-            # Use this instead of work.download_to_file to prevent zero-byte files.
-            content = work_item.work.download(self.config.filetype)
-            if not content:
-                return (Status.ERROR, {"error": "Downloaded 0 bytes"})
-            with open(download_path, "wb") as file:
-                file.write(content)
-            work_item.download_path = download_path
-            self._set_work_item(work_id, work_item)
-            return (Status.OK, {"work_item": work_item})
-        except (AttributeError, AO3.utils.HTTPError):
-            # This is a hack due to how the AO3 API works right now. Since the
-            # work must be loaded before download, AttributeError due to the
-            # work not being accessible should be propagated from the load.
-            # work_item.work.download can throw since the soup object can be
-            # None when we are being rate limited.
-            LOG.warning(
-                f"Hit rate limit trying to download work {work_id}. Attempting to retry..."
-            )
-            return (Status.RETRY, {})
-        except Exception as e:
-            LOG.error(f"Error downloading work id {work_id}: {e}")
-            return (Status.ERROR, {"error": str(e)})
+                # Use this instead of work.download_to_file to prevent zero-byte files.
+                n_bytes = ao3_extensions.download_work_to_file(
+                    work_item.work, self.config.filetype, download_path
+                )
+                if not n_bytes:
+                    return (Status.ERROR, {"error": "Downloaded 0 bytes"})
+                work_item.download_path = download_path
+                return (Status.OK, {"work_item": work_item})
+            except (AttributeError, AO3.utils.HTTPError):
+                # This is a hack due to how the AO3 API works right now. Since the
+                # work must be loaded before download, AttributeError due to the
+                # work not being accessible should be propagated from the load.
+                # work_item.work.download can throw since the soup object can be
+                # None when we are being rate limited.
+                LOG.warning(
+                    "Hit rate limit trying to download work %s. Attempting to retry...",
+                    work_id,
+                )
+                return (Status.RETRY, {})
+            except Exception as e:
+                LOG.error("Error downloading work id %s: %s", work_id, e)
+                return (Status.ERROR, {"error": str(e)})
 
     def _load_works_from_series(self, series_id: int) -> Tuple[Status, Kwargs]:
         """Function to be called from a worker thread.
@@ -640,16 +752,16 @@ class Engine:
         """
         try:
             series = Series(series_id)
-            for work in series.work_list:
-                self._enqueue_work_action(work.id, Action.LOAD_WORK)
+            self._enqueue_work_actions(map(_get_id, series.work_list), Action.LOAD_WORK)
             return (Status.OK, {"series": series})
         except AO3.utils.HTTPError:
             LOG.warning(
-                f"Hit rate limit trying to load series {series_id}. Attempting to retry..."
+                "Hit rate limit trying to load series %s. Attempting to retry...",
+                series_id,
             )
             return (Status.RETRY, {})
         except Exception as e:
-            LOG.error(f"Error loading series id {series_id}: {e}")
+            LOG.error("Error loading series id %s: %s", series_id, e)
             return (Status.ERROR, {"error": str(e)})
 
     def _load_works_from_user(self, username: str) -> Tuple[Status, Kwargs]:
@@ -668,18 +780,18 @@ class Engine:
 
             user = User(username)
             works = user.get_works(use_threading=self.config.should_use_threading)
-            for work in works:
-                self._enqueue_work_action(work.id, Action.LOAD_WORK)
+            self._enqueue_work_actions(map(_get_id, works), Action.LOAD_WORK)
             return (Status.OK, {"user": user})
         except (AttributeError, AO3.utils.HTTPError):
             # This is a hack due to how the AO3 API works right now.
             LOG.warning(
-                f"Hit rate limit trying to load works from user {username}. "
-                f"Attempting to retry..."
+                "Hit rate limit trying to load works from user %s. "
+                "Attempting to retry...",
+                username,
             )
             return (Status.RETRY, {})
         except Exception as e:
-            LOG.error(f"Error loading works from user {username}: {e}")
+            LOG.error("Error loading works from user %s: %s", username, e)
             return (Status.ERROR, {"error": str(e)})
 
     def _load_bookmarks_from_user(self, username: str) -> Tuple[Status, Kwargs]:
@@ -709,18 +821,18 @@ class Engine:
                     use_threading=self.config.should_use_threading
                 )
                 kwargs = {"user": user}
-            for work in bookmarks:
-                self._enqueue_work_action(work.id, Action.LOAD_WORK)
+            self._enqueue_work_actions(map(_get_id, bookmarks), Action.LOAD_WORK)
             return (Status.OK, kwargs)
         except (AttributeError, AO3.utils.HTTPError):
             # This is a hack due to how the AO3 API works right now.
             LOG.warning(
-                f"Hit rate limit trying to load bookmarks from user {username}. "
-                f"Attempting to retry..."
+                "Hit rate limit trying to load bookmarks from user %s. "
+                "Attempting to retry...",
+                username,
             )
             return (Status.RETRY, {})
         except Exception as e:
-            LOG.error(f"Error loading bookmarks from user {username}: {e}")
+            LOG.error("Error loading bookmarks from user %s: %s", username, e)
             return (Status.ERROR, {"error": str(e)})
 
     def _load_pages_from_results_list(
@@ -732,7 +844,7 @@ class Engine:
         on those pages can be loaded.
         """
         try:
-            results = Results(url, page_start, page_end, self.session.session)
+            results = Results(url, page_start, page_end, self._get_results_session())
             results.update()
             for page in range(
                 max(1, results.page_start), min(results.pages, results.page_end) + 1
@@ -741,11 +853,11 @@ class Engine:
             return (Status.OK, {"results": results})
         except AO3.utils.HTTPError:
             LOG.warning(
-                f"Hit rate limit trying to load url `{url}`. " f"Attempting to retry..."
+                "Hit rate limit trying to load url `%s`. Attempting to retry...", url
             )
             return (Status.RETRY, {})
         except Exception as e:
-            LOG.error(f"Error loading results list for url `{url}`: {e}")
+            LOG.error("Error loading results list for url `%s`: %s", url, e)
             return (Status.ERROR, {"error": str(e)})
 
     def _load_works_from_results_page(
@@ -756,19 +868,20 @@ class Engine:
         This will enqueue all works on the page to be loaded.
         """
         try:
-            results_page = ResultsPage(url, page, self.session.session)
+            results_page = ResultsPage(url, page, self._get_results_session())
             results_page.update()
-            for work_id in results_page.work_ids:
-                self._enqueue_work_action(work_id, Action.LOAD_WORK)
+            self._enqueue_work_actions(results_page.work_ids, Action.LOAD_WORK)
             return (Status.OK, {"results_page": results_page})
         except AO3.utils.HTTPError:
             LOG.warning(
-                f"Hit rate limit trying to load page {page} of url `{url}`. "
-                f"Attempting to retry..."
+                "Hit rate limit trying to load page %s of url `%s`. "
+                "Attempting to retry...",
+                page,
+                url,
             )
             return (Status.RETRY, {})
         except Exception as e:
-            LOG.error(f"Error loading results page {page} for url `{url}`: {e}")
+            LOG.error("Error loading results page %s for url `%s`: %s", page, url, e)
             return (Status.ERROR, {"error": str(e)})
 
     # Utility functions
@@ -779,14 +892,62 @@ class Engine:
         with cross-platform filesystems. The file will be saved in the download
         directory specified in the configuration, and optionally in a folder
         with the logged-in user's username.
+
+        Paths are cached per work ID until the settings or session change.
         """
-        return (
-            self.config.downloads_dir
-            / self.session.username
-            / (f"{work.id}_{slugify(work.title)}.{self.config.filetype.lower()}")
-        )
+        download_path = self._download_paths.get(work.id)
+        if download_path is None:
+            download_path = self._get_user_downloads_dir() / (
+                f"{work.id}_{slugify(work.title)}.{self.config.filetype.lower()}"
+            )
+            self._download_paths[work.id] = download_path
+        return download_path
+
+    def _get_user_downloads_dir(self) -> Path:
+        """Utility function for getting the directory downloads are saved to.
+
+        This is the download directory specified in the configuration, in a
+        folder with the logged-in user's username. The path is cached until
+        the settings or session change.
+        """
+        if self._user_downloads_dir is None:
+            self._user_downloads_dir = self.config.downloads_dir / self.session.username
+        return self._user_downloads_dir
+
+    def _clear_path_caches(self) -> None:
+        """Forget cached download paths.
+
+        This must be called whenever the downloads directory, filetype or
+        session changes, since all of them are part of the paths.
+        """
+        self._user_downloads_dir = None
+        self._download_paths.clear()
+
+    def _is_download_up_to_date(self, work: Work, download_path: Path) -> bool:
+        """Utility function for checking whether a file from a previous run
+        can be reused instead of downloading the work again.
+
+        The file is considered up to date if it is not empty and was written
+        after the work was last edited on AO3.
+        """
+        try:
+            stat = download_path.stat()
+            return stat.st_size > 0 and stat.st_mtime >= work.date_edited.timestamp()
+        except Exception:
+            return False
+
+    def _get_results_session(self) -> Optional[requests.Session]:
+        """Utility function for getting the session to fetch listing pages with.
+
+        Guests use the shared session from `ao3_extensions`, which may cache
+        responses on disk. Pages fetched while logged in can show restricted
+        works, so those always use the authenticated session instead.
+        """
+        if self.session.is_authed:
+            return self.session.session
+        return None
 
     def _verify_download_directory_exists(self) -> None:
         """Verify the download directory exists, and create it if it doesn't."""
-        downloads_dir = self.config.downloads_dir / self.session.username
+        downloads_dir = self._get_user_downloads_dir()
         downloads_dir.mkdir(parents=True, exist_ok=True)
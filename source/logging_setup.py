@@ -0,0 +1,50 @@
+import logging
+import logging.handlers
+import queue
+
+from pathlib import Path
+from typing import List
+
+from . import constants
+
+LOG_FORMAT = "%(asctime)s [%(name)s] [%(threadName)s] [%(levelname)s] %(message)s"
+LOG_DATE_FORMAT = "%m/%d/%Y %I:%M:%S%p"
+
+
+def configure(
+    log_file: Path = Path(constants.LOG_FILE), to_console: bool = True
+) -> logging.handlers.QueueListener:
+    """Sets up logging to the log file and optionally the console.
+
+    Records are put on a queue by the threads that log them, and a single
+    listener thread formats them and writes them out. This way worker threads
+    do not block on writing to the log file. The returned listener must be
+    stopped before exiting so that all pending records are written.
+
+    Logs from previous runs are kept, the log file is rotated once it grows
+    past a few megabytes.
+    """
+    formatter = logging.Formatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT)
+    handlers: List[logging.Handler] = [
+        logging.handlers.RotatingFileHandler(
+            log_file,
+            maxBytes=constants.LOG_FILE_MAX_BYTES,
+            backupCount=constants.LOG_FILE_BACKUP_COUNT,
+            encoding="utf-8",
+        )
+    ]
+    if to_console:
+        handlers.append(logging.StreamHandler())
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    listener.start()
+    return listener
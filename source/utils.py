@@ -1,6 +1,8 @@
 import AO3
+import functools
 import logging
 import os
+import re
 import requests
 import subprocess
 import urllib.parse
@@ -20,6 +22,25 @@ def open_file(filename: Path) -> None:
         subprocess.call(["open", str(filename)])
 
 
+# The ID is the path segment following "works" or "series", up to the next
+# "/" or the query string.
+_WORK_ID_REGEX = re.compile(r"(?:^|/)works/(\d+)(?=[/?]|$)")
+_SERIES_ID_REGEX = re.compile(r"(?:^|/)series/(\d+)(?=[/?]|$)")
+
+
+@functools.lru_cache(maxsize=4096)
+def work_id_from_url(url: str) -> Optional[int]:
+    """Get the work ID from an archiveofourown.org website url
+    Args:
+        url (str): Work URL
+    Returns:
+        int: Work ID
+    """
+    match = _WORK_ID_REGEX.search(url)
+    return int(match.group(1)) if match else None
+
+
+@functools.lru_cache(maxsize=4096)
 def series_id_from_url(url: str) -> Optional[int]:
     """Get the series ID from an archiveofourown.org website url
     Args:
@@ -27,16 +48,8 @@ def series_id_from_url(url: str) -> Optional[int]:
     Returns:
         int: Series ID
     """
-    split_url = url.split("/")
-    try:
-        index = split_url.index("series")
-    except ValueError:
-        return
-    if len(split_url) >= index + 1:
-        series_id = split_url[index + 1].split("?")[0]
-        if series_id.isdigit():
-            return int(series_id)
-    return None
+    match = _SERIES_ID_REGEX.search(url)
+    return int(match.group(1)) if match else None
 
 
 def does_user_exist(username: str, session: requests.Session) -> bool: